@@ -1,7 +1,11 @@
 from __future__ import annotations
 
 import glob
+import threading
 import time
+from collections.abc import Iterator, Sequence
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -14,6 +18,7 @@ from lidar_pc.utils import (
     ensure_dir,
     now_capture_ns,
     now_wall_ms,
+    ordered_map,
     read_json,
     read_jsonl,
     write_json,
@@ -29,13 +34,80 @@ class CaptureSummary:
     keyframes: int
 
 
-def variance_of_laplacian(gray: np.ndarray) -> float:
-    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+@dataclass(slots=True)
+class _SourceFrame:
+    """A decoded input frame (BGR or grayscale) plus its original JPEG bytes, if any."""
+
+    image: np.ndarray
+    jpeg: bytes | None = None
+
+
+def _write_keyframe(path: Path, frame: _SourceFrame) -> bool:
+    if frame.jpeg is not None:
+        path.write_bytes(frame.jpeg)
+        return True
+    return cv2.imwrite(str(path), frame.image)
+
+
+class _KeyframeWriter:
+    """Encodes keyframe JPEGs on worker threads so capture is not stalled on disk I/O.
+
+    At most ``max_pending`` frames are queued at once to bound memory use.
+    """
+
+    def __init__(self, max_workers: int = 2, max_pending: int = 4) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=max_workers)
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._pending: list[tuple[Path, Future[bool]]] = []
+
+    def __enter__(self) -> _KeyframeWriter:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._executor.shutdown(wait=True)
+
+    def submit(self, path: Path, frame: _SourceFrame) -> None:
+        self._slots.acquire()
+        future = self._executor.submit(_write_keyframe, path, frame)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._pending.append((path, future))
+
+    def failed_paths(self) -> list[Path]:
+        return [path for path, future in self._pending if not future.result()]
+
+
+def _to_gray(image: np.ndarray) -> np.ndarray:
+    return image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+
+
+def opencl_available() -> bool:
+    return cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
+
+
+def keyframe_gray(frame: np.ndarray, use_opencl: bool = False) -> np.ndarray | cv2.UMat:
+    # Blur and motion are scored on the half-resolution image.
+    source = cv2.UMat(frame) if use_opencl else frame
+    gray = source if frame.ndim == 2 else cv2.cvtColor(source, cv2.COLOR_BGR2GRAY)
+    return cv2.pyrDown(gray)
+
+
+def variance_of_laplacian(gray: np.ndarray | cv2.UMat) -> float:
+    _, stddev = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_16S))
+    if isinstance(stddev, cv2.UMat):
+        stddev = stddev.get()
+    return float(stddev[0, 0]) ** 2
+
+
+def _mean_abs_diff(first: np.ndarray | cv2.UMat, second: np.ndarray | cv2.UMat) -> float:
+    if isinstance(first, cv2.UMat):
+        # UMat has no .size.
+        return float(cv2.mean(cv2.absdiff(first, second))[0])
+    return cv2.norm(first, second, cv2.NORM_L1) / float(first.size)
 
 
 def should_keep_keyframe(
-    prev_gray: np.ndarray | None,
-    current_gray: np.ndarray,
+    prev_gray: np.ndarray | cv2.UMat | None,
+    current_gray: np.ndarray | cv2.UMat,
     frame_index: int,
     frame_interval: int,
     pixel_delta_threshold: float,
@@ -46,10 +118,11 @@ def should_keep_keyframe(
         return True
     if blur_score < blur_threshold:
         return False
+    if frame_index % max(frame_interval, 1) != 0:
+        return False
     if prev_gray is None:
-        return frame_index % max(frame_interval, 1) == 0
-    delta = float(np.mean(cv2.absdiff(prev_gray, current_gray)))
-    return frame_index % max(frame_interval, 1) == 0 and delta >= pixel_delta_threshold
+        return True
+    return _mean_abs_diff(prev_gray, current_gray) >= pixel_delta_threshold
 
 
 def _infer_intrinsics(width: int, height: int, camera_id: str) -> Intrinsics:
@@ -76,6 +149,19 @@ def load_frame_records(session_dir: Path) -> list[FrameRecord]:
     return [FrameRecord.from_dict(row) for row in rows]
 
 
+def read_keyframe_image(session_dir: Path, record: FrameRecord) -> np.ndarray | None:
+    return cv2.imread(str(session_dir / record.relative_rgb_path), cv2.IMREAD_GRAYSCALE)
+
+
+KeyframeFeatures = tuple[Sequence[cv2.KeyPoint], np.ndarray | None]
+
+
+def detect_keyframe_features(orb: cv2.ORB, image: np.ndarray | None) -> KeyframeFeatures | None:
+    if image is None:
+        return None
+    return orb.detectAndCompute(image, None)
+
+
 def load_intrinsics(session_dir: Path) -> Intrinsics:
     return Intrinsics.from_dict(read_json(session_dir / "meta" / "intrinsics.json"))
 
@@ -90,7 +176,7 @@ def _capture_from_camera(
     auto_fix_wsl_camera: bool = True,
     wsl_busid: str | None = None,
     allow_wsl_bind: bool = False,
-) -> list[np.ndarray]:
+) -> Iterator[_SourceFrame]:
     cap = cv2.VideoCapture(camera_index)
     if not cap.isOpened():
         if auto_fix_wsl_camera:
@@ -106,28 +192,88 @@ def _capture_from_camera(
         else:
             raise RuntimeError(f"Unable to open camera index {camera_index}")
 
+    raw_jpeg = _enable_jpeg_passthrough(cap)
     cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
     cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
     cap.set(cv2.CAP_PROP_FPS, fps_target)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return _stream_camera(cap, max_frames=max_frames, duration_s=duration_s, raw_jpeg=raw_jpeg)
+
+
+def _enable_jpeg_passthrough(cap: cv2.VideoCapture) -> bool:
+    """Switch the stream to undecoded MJPG, restoring the original format if unsupported."""
+    original_fourcc = cap.get(cv2.CAP_PROP_FOURCC)
+    mjpg = cv2.VideoWriter_fourcc(*"MJPG")
+    if (
+        cap.set(cv2.CAP_PROP_FOURCC, mjpg)
+        and int(cap.get(cv2.CAP_PROP_FOURCC)) == mjpg
+        and cap.set(cv2.CAP_PROP_CONVERT_RGB, 0)
+    ):
+        return True
+    cap.set(cv2.CAP_PROP_FOURCC, original_fourcc)
+    return False
 
-    frames: list[np.ndarray] = []
+
+_MAX_UNDECODABLE_FRAMES = 30
+
+
+def _is_jpeg_buffer(buffer: np.ndarray) -> bool:
+    return (
+        buffer.dtype == np.uint8
+        and buffer.size > 2
+        and (buffer.ndim == 1 or min(buffer.shape[:2]) == 1)
+        and buffer.flat[0] == 0xFF
+        and buffer.flat[1] == 0xD8
+    )
+
+
+def _camera_frame(buffer: np.ndarray, raw_jpeg: bool) -> _SourceFrame | None:
+    if not raw_jpeg:
+        return _SourceFrame(buffer)
+    if _is_jpeg_buffer(buffer):
+        gray = cv2.imdecode(buffer, cv2.IMREAD_GRAYSCALE)
+        return None if gray is None else _SourceFrame(gray, jpeg=buffer.tobytes())
+    # Some backends ignore CONVERT_RGB=0 and still hand back decoded BGR frames.
+    return _SourceFrame(buffer) if buffer.ndim == 3 and buffer.shape[2] == 3 else None
+
+
+def _stream_camera(
+    cap: cv2.VideoCapture,
+    max_frames: int,
+    duration_s: float | None,
+    raw_jpeg: bool,
+) -> Iterator[_SourceFrame]:
+    count = 0
+    undecodable = 0
     started = time.time()
-    frame_period = 1.0 / max(fps_target, 1)
     try:
-        while len(frames) < max_frames:
+        while count < max_frames:
             if duration_s is not None and (time.time() - started) >= duration_s:
                 break
-            ok, frame = cap.read()
+            ok, buffer = cap.read()
             if not ok:
                 continue
-            frames.append(frame)
-            time.sleep(frame_period)
+            frame = _camera_frame(buffer, raw_jpeg)
+            if frame is None:
+                if not _is_jpeg_buffer(buffer):
+                    # CONVERT_RGB=0 was accepted but the backend hands back raw YUY2/NV12.
+                    cap.set(cv2.CAP_PROP_CONVERT_RGB, 1)
+                    raw_jpeg = False
+                    continue
+                undecodable += 1
+                if undecodable >= _MAX_UNDECODABLE_FRAMES:
+                    raise RuntimeError(
+                        f"Camera delivered {undecodable} consecutive undecodable JPEG frames."
+                    )
+                continue
+            undecodable = 0
+            count += 1
+            yield frame
     finally:
         cap.release()
-    return frames
 
 
-def _capture_from_files(pattern: str, max_frames: int) -> list[np.ndarray]:
+def _capture_from_files(pattern: str, max_frames: int) -> Iterator[_SourceFrame]:
     paths = sorted(Path(p) for p in glob.glob(pattern))
     if not paths:
         raise RuntimeError(
@@ -135,43 +281,71 @@ def _capture_from_files(pattern: str, max_frames: int) -> list[np.ndarray]:
             "Run from the repo root or pass a correct --input-glob."
         )
 
-    frames: list[np.ndarray] = []
-    for path in paths[:max_frames]:
-        frame = cv2.imread(str(path))
-        if frame is None:
-            continue
-        frames.append(frame)
+    return _stream_files(paths[:max_frames])
 
-    if not frames:
+
+def _read_image_file(path: Path) -> _SourceFrame | None:
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    if not data:
+        return None
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    image = cv2.imdecode(buffer, cv2.IMREAD_COLOR)
+    if image is None:
+        return None
+    return _SourceFrame(image, jpeg=data if _is_jpeg_buffer(buffer) else None)
+
+
+def _stream_files(paths: list[Path]) -> Iterator[_SourceFrame]:
+    count = 0
+    for frame in ordered_map(_read_image_file, paths):
+        if frame is not None:
+            count += 1
+            yield frame
+
+    if count == 0:
         raise RuntimeError("No readable input images were found.")
-    return frames
 
 
-def _capture_from_video(video_path: Path, max_frames: int, frame_step: int = 1) -> list[np.ndarray]:
+def _capture_from_video(
+    video_path: Path,
+    max_frames: int,
+    frame_step: int = 1,
+) -> Iterator[_SourceFrame]:
     if not video_path.exists():
         raise RuntimeError(f"Video file not found: {video_path}")
 
     cap = cv2.VideoCapture(str(video_path))
     if not cap.isOpened():
         raise RuntimeError(f"Unable to open video file: {video_path}")
+    return _stream_video(cap, video_path, max_frames=max_frames, frame_step=frame_step)
+
 
-    frames: list[np.ndarray] = []
+def _stream_video(
+    cap: cv2.VideoCapture,
+    video_path: Path,
+    max_frames: int,
+    frame_step: int,
+) -> Iterator[_SourceFrame]:
+    count = 0
     read_index = 0
     step = max(frame_step, 1)
     try:
-        while len(frames) < max_frames:
+        while count < max_frames:
             ok, frame = cap.read()
             if not ok:
                 break
             if read_index % step == 0:
-                frames.append(frame)
+                count += 1
+                yield _SourceFrame(frame)
             read_index += 1
     finally:
         cap.release()
 
-    if not frames:
+    if count == 0:
         raise RuntimeError(f"No readable frames found in video: {video_path}")
-    return frames
 
 
 def capture_session(
@@ -186,8 +360,9 @@ def capture_session(
     resolution_width: int = 1280,
     resolution_height: int = 720,
     frame_interval: int = 4,
-    blur_threshold: float = 40.0,
+    blur_threshold: float = 8.0,
     pixel_delta_threshold: float = 10.0,
+    use_opencl: bool = False,
     input_glob: str | None = None,
     input_video: Path | None = None,
     video_frame_step: int = 1,
@@ -225,40 +400,52 @@ def capture_session(
             allow_wsl_bind=allow_wsl_bind,
         )
 
-    records: list[FrameRecord] = []
-    previous_keyframe_gray: np.ndarray | None = None
-    for frame_index, frame in enumerate(source_frames):
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        blur = variance_of_laplacian(gray)
-        keep = capture_mode == "full_stream" or should_keep_keyframe(
-            prev_gray=previous_keyframe_gray,
-            current_gray=gray,
-            frame_index=frame_index,
-            frame_interval=frame_interval,
-            pixel_delta_threshold=pixel_delta_threshold,
-            blur_score=blur,
-            blur_threshold=blur_threshold,
-        )
-        if not keep:
-            continue
-
-        keyframe_index = len(records)
-        filename = f"frame_{keyframe_index:06d}.jpg"
-        frame_path = rgb_dir / filename
-        cv2.imwrite(str(frame_path), frame)
-        records.append(
-            FrameRecord(
+    records: list[dict[str, object]] = []
+    previous_keyframe_gray: np.ndarray | cv2.UMat | None = None
+    use_opencl = use_opencl and opencl_available()
+    full_stream = capture_mode == "full_stream"
+    interval = max(frame_interval, 1)
+    total_source_frames = 0
+    with _KeyframeWriter() as writer:
+        for frame_index, frame in enumerate(source_frames):
+            total_source_frames = frame_index + 1
+            if not full_stream and frame_index != 0 and frame_index % interval != 0:
+                continue
+            gray = keyframe_gray(frame.image, use_opencl=use_opencl)
+            blur = variance_of_laplacian(gray)
+            keep = full_stream or should_keep_keyframe(
+                prev_gray=previous_keyframe_gray,
+                current_gray=gray,
                 frame_index=frame_index,
-                keyframe_index=keyframe_index,
-                relative_rgb_path=f"rgb/{filename}",
-                t_capture_ns=now_capture_ns(),
-                t_wall_ms=now_wall_ms(),
-                width=int(frame.shape[1]),
-                height=int(frame.shape[0]),
+                frame_interval=frame_interval,
+                pixel_delta_threshold=pixel_delta_threshold,
                 blur_score=blur,
+                blur_threshold=blur_threshold,
             )
-        )
-        previous_keyframe_gray = gray
+            if not keep:
+                continue
+
+            keyframe_index = len(records)
+            filename = f"frame_{keyframe_index:06d}.jpg"
+            frame_path = rgb_dir / filename
+            writer.submit(frame_path, frame)
+            records.append(
+                {
+                    "frame_index": frame_index,
+                    "keyframe_index": keyframe_index,
+                    "relative_rgb_path": f"rgb/{filename}",
+                    "t_capture_ns": now_capture_ns(),
+                    "t_wall_ms": now_wall_ms(),
+                    "width": int(frame.image.shape[1]),
+                    "height": int(frame.image.shape[0]),
+                    "blur_score": blur,
+                }
+            )
+            previous_keyframe_gray = gray
+
+    failed_writes = writer.failed_paths()
+    if failed_writes:
+        raise RuntimeError(f"Failed to write keyframe image: {failed_writes[0]}")
 
     if not records:
         raise RuntimeError(
@@ -267,12 +454,12 @@ def capture_session(
 
     intrinsics = _load_intrinsics(
         path=intrinsics_path,
-        width=records[0].width,
-        height=records[0].height,
+        width=int(records[0]["width"]),
+        height=int(records[0]["height"]),
         camera_id=camera_id,
     )
     write_json(meta_dir / "intrinsics.json", intrinsics.to_dict())
-    write_jsonl(meta_dir / "frames.jsonl", [record.to_dict() for record in records])
+    write_jsonl(meta_dir / "frames.jsonl", records)
     write_json(
         meta_dir / "session.json",
         {
@@ -289,11 +476,33 @@ def capture_session(
     )
     return CaptureSummary(
         session_dir=session_dir,
-        total_source_frames=len(source_frames),
+        total_source_frames=total_source_frames,
         keyframes=len(records),
     )
 
 
+def _detect_corners(
+    image: np.ndarray,
+    pattern: tuple[int, int],
+) -> tuple[tuple[int, int], np.ndarray] | None:
+    gray = _to_gray(image)
+    found, corners = cv2.findChessboardCorners(
+        gray,
+        pattern,
+        flags=cv2.CALIB_CB_ADAPTIVE_THRESH | cv2.CALIB_CB_NORMALIZE_IMAGE | cv2.CALIB_CB_FAST_CHECK,
+    )
+    if not found:
+        return None
+    refined = cv2.cornerSubPix(
+        gray,
+        corners,
+        winSize=(11, 11),
+        zeroZone=(-1, -1),
+        criteria=(cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001),
+    )
+    return (gray.shape[1], gray.shape[0]), refined
+
+
 def calibrate_camera(
     *,
     output_path: Path,
@@ -309,10 +518,12 @@ def calibrate_camera(
     imgpoints: list[np.ndarray] = []
     pattern = (board_cols, board_rows)
     objp = np.zeros((board_rows * board_cols, 3), np.float32)
-    grid = np.mgrid[0:board_cols, 0:board_rows].T.reshape(-1, 2)
-    objp[:, :2] = grid * (square_mm / 1000.0)
+    grid = np.indices((board_rows, board_cols), dtype=np.float32)
+    objp[:, 0] = grid[1].ravel()
+    objp[:, 1] = grid[0].ravel()
+    objp[:, :2] *= square_mm / 1000.0
 
-    source_frames: list[np.ndarray]
+    source_frames: Iterator[_SourceFrame]
     if input_glob:
         source_frames = _capture_from_files(pattern=input_glob, max_frames=samples * 5)
     else:
@@ -326,23 +537,16 @@ def calibrate_camera(
         )
 
     image_shape: tuple[int, int] | None = None
-    for frame in source_frames:
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        found, corners = cv2.findChessboardCorners(gray, pattern, None)
-        if not found:
-            continue
-        image_shape = (gray.shape[1], gray.shape[0])
-        refined = cv2.cornerSubPix(
-            gray,
-            corners,
-            winSize=(11, 11),
-            zeroZone=(-1, -1),
-            criteria=(cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001),
-        )
-        objpoints.append(objp)
-        imgpoints.append(refined)
-        if len(objpoints) >= samples:
-            break
+    detections = ordered_map(lambda frame: _detect_corners(frame.image, pattern), source_frames)
+    with closing(detections):
+        for detection in detections:
+            if detection is None:
+                continue
+            image_shape, refined = detection
+            objpoints.append(objp)
+            imgpoints.append(refined)
+            if len(objpoints) >= samples:
+                break
 
     if len(objpoints) < 5 or image_shape is None:
         source = f"pattern '{input_glob}'" if input_glob else f"camera index {camera_index}"
@@ -4,12 +4,7 @@ import argparse
 import sys
 from pathlib import Path
 
-from lidar_pc.capture import calibrate_camera, capture_session
 from lidar_pc.config import load_config
-from lidar_pc.doctor import run_doctor
-from lidar_pc.exporter import generate_capture_packets
-from lidar_pc.reconstruction import run_reconstruction
-from lidar_pc.tracking import run_tracking
 
 
 def _parser() -> argparse.ArgumentParser:
@@ -161,6 +156,8 @@ def main(argv: list[str] | None = None) -> int:
     config = load_config(args.config if args.config and args.config.exists() else None)
 
     if args.command == "doctor":
+        from lidar_pc.doctor import run_doctor
+
         checks, healthy = run_doctor(
             camera_index=args.camera_index,
             skip_camera=args.skip_camera,
@@ -173,6 +170,8 @@ def main(argv: list[str] | None = None) -> int:
         return 0 if healthy else 1
 
     if args.command == "calibrate":
+        from lidar_pc.capture import calibrate_camera
+
         rows, cols = _parse_board(args.board)
         output = args.out or Path("calibration") / f"{args.camera_id}.json"
         intrinsics = calibrate_camera(
@@ -192,6 +191,8 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.command == "capture":
+        from lidar_pc.capture import capture_session
+
         if args.input_glob and args.input_video:
             raise SystemExit("Pass only one of --input-glob or --input-video.")
         output_root = args.out or Path(config.paths.output_root)
@@ -208,6 +209,7 @@ def main(argv: list[str] | None = None) -> int:
             frame_interval=config.capture.keyframe_interval,
             blur_threshold=config.capture.keyframe_blur_threshold,
             pixel_delta_threshold=config.capture.keyframe_pixel_delta_threshold,
+            use_opencl=config.capture.keyframe_use_opencl,
             input_glob=args.input_glob,
             input_video=args.input_video,
             video_frame_step=args.video_frame_step,
@@ -225,6 +227,9 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.command == "reconstruct":
+        from lidar_pc.reconstruction import run_reconstruction
+        from lidar_pc.tracking import run_tracking
+
         session_dir = args.session
         tracking = run_tracking(
             session_dir=session_dir,
@@ -244,11 +249,18 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.command == "export":
+        from lidar_pc.exporter import generate_capture_packets
+
         summary = generate_capture_packets(session_dir=args.session, capture_mode=args.mode)
         print(f"packets={summary.packet_count} manifest={summary.manifest_path}")
         return 0
 
     if args.command == "run":
+        from lidar_pc.capture import capture_session
+        from lidar_pc.exporter import generate_capture_packets
+        from lidar_pc.reconstruction import run_reconstruction
+        from lidar_pc.tracking import run_tracking
+
         if args.input_glob and args.input_video:
             raise SystemExit("Pass only one of --input-glob or --input-video.")
         output_root = args.out or Path(config.paths.output_root)
@@ -265,6 +277,7 @@ def main(argv: list[str] | None = None) -> int:
             frame_interval=config.capture.keyframe_interval,
             blur_threshold=config.capture.keyframe_blur_threshold,
             pixel_delta_threshold=config.capture.keyframe_pixel_delta_threshold,
+            use_opencl=config.capture.keyframe_use_opencl,
             input_glob=args.input_glob,
             input_video=args.input_video,
             video_frame_step=args.video_frame_step,
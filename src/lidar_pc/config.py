@@ -15,8 +15,9 @@ class CaptureConfig:
     resolution_width: int = 1280
     resolution_height: int = 720
     keyframe_interval: int = 4
-    keyframe_blur_threshold: float = 40.0
+    keyframe_blur_threshold: float = 8.0
     keyframe_pixel_delta_threshold: float = 10.0
+    keyframe_use_opencl: bool = False
     max_frames: int = 240
 
 
@@ -79,6 +80,9 @@ def load_config(path: Path | None) -> AppConfig:
     capture.keyframe_pixel_delta_threshold = float(
         cap_raw.get("keyframe_pixel_delta_threshold", capture.keyframe_pixel_delta_threshold)
     )
+    capture.keyframe_use_opencl = bool(
+        cap_raw.get("keyframe_use_opencl", capture.keyframe_use_opencl)
+    )
     capture.max_frames = int(cap_raw.get("max_frames", capture.max_frames))
 
     tracking.min_inliers = int(trk_raw.get("min_inliers", tracking.min_inliers))
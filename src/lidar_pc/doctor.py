@@ -1,9 +1,9 @@
 from __future__ import annotations
 
-import importlib
 import platform
 import sys
 from dataclasses import dataclass
+from importlib.util import find_spec
 
 import cv2
 
@@ -18,14 +18,31 @@ class DoctorCheck:
 
 
 def _check_module(module_name: str, required: bool) -> DoctorCheck:
-    try:
-        importlib.import_module(module_name)
-    except ModuleNotFoundError:
+    if find_spec(module_name) is None:
         state = "fail" if required else "warn"
         return DoctorCheck(module_name, state, "not installed")
     return DoctorCheck(module_name, "ok", "installed")
 
 
+def _probe_camera(camera_index: int) -> tuple[bool, bool]:
+    """Return (opened, frame_grabbed) for a camera index, always releasing it."""
+    camera = cv2.VideoCapture(camera_index)
+    try:
+        if not camera.isOpened():
+            return False, False
+        return True, bool(camera.grab())
+    finally:
+        camera.release()
+
+
+def _camera_check(name: str, camera_index: int, opened: bool, grabbed: bool) -> DoctorCheck:
+    if not opened:
+        return DoctorCheck(name, "fail", f"unable to open index {camera_index}")
+    if not grabbed:
+        return DoctorCheck(name, "fail", f"index {camera_index} opened but no frame")
+    return DoctorCheck(name, "ok", f"index {camera_index} available")
+
+
 def run_doctor(
     camera_index: int = 0,
     skip_camera: bool = False,
@@ -53,52 +70,16 @@ def run_doctor(
     if skip_camera:
         checks.append(DoctorCheck("camera", "warn", "skipped"))
     else:
-        camera = cv2.VideoCapture(camera_index)
-        if not camera.isOpened():
-            checks.append(DoctorCheck("camera", "fail", f"unable to open index {camera_index}"))
-            if auto_fix_wsl_camera and is_wsl_environment():
-                fix = attempt_wsl_camera_fix(requested_busid=wsl_busid, allow_bind=allow_wsl_bind)
-                status = "ok" if fix.success else ("warn" if fix.attempted else "fail")
-                details = "; ".join(fix.messages) if fix.messages else "no diagnostic output"
-                checks.append(DoctorCheck("wsl_fix", status, details))
-                if fix.success:
-                    camera.release()
-                    camera = cv2.VideoCapture(camera_index)
-                    if camera.isOpened():
-                        ok, _ = camera.read()
-                        if ok:
-                            checks.append(
-                                DoctorCheck("camera_retry", "ok", f"index {camera_index} available")
-                            )
-                        else:
-                            checks.append(
-                                DoctorCheck(
-                                    "camera_retry",
-                                    "fail",
-                                    f"index {camera_index} opened but no frame",
-                                )
-                            )
-                    else:
-                        checks.append(
-                            DoctorCheck(
-                                "camera_retry",
-                                "fail",
-                                f"unable to open index {camera_index}",
-                            )
-                        )
-        else:
-            ok, _ = camera.read()
-            if ok:
-                checks.append(DoctorCheck("camera", "ok", f"index {camera_index} available"))
-            else:
-                checks.append(
-                    DoctorCheck(
-                        "camera",
-                        "fail",
-                        f"index {camera_index} opened but no frame",
-                    )
-                )
-        camera.release()
+        opened, grabbed = _probe_camera(camera_index)
+        checks.append(_camera_check("camera", camera_index, opened, grabbed))
+        if not opened and auto_fix_wsl_camera and is_wsl_environment():
+            fix = attempt_wsl_camera_fix(requested_busid=wsl_busid, allow_bind=allow_wsl_bind)
+            status = "ok" if fix.success else ("warn" if fix.attempted else "fail")
+            details = "; ".join(fix.messages) if fix.messages else "no diagnostic output"
+            checks.append(DoctorCheck("wsl_fix", status, details))
+            if fix.success:
+                opened, grabbed = _probe_camera(camera_index)
+                checks.append(_camera_check("camera_retry", camera_index, opened, grabbed))
 
     healthy = True
     for check in checks:
@@ -1,14 +1,19 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cache
 from pathlib import Path
 
-from jsonschema import validate
+from jsonschema.protocols import Validator
+from jsonschema.validators import validator_for
 
 from lidar_pc.capture import load_frame_records, load_intrinsics
-from lidar_pc.models import TrajectoryPose
-from lidar_pc.utils import now_wall_ms, read_json, sha256_file, write_json
+from lidar_pc.models import FrameRecord, TrajectoryPose
+from lidar_pc.utils import dumps_json, now_wall_ms, read_json, sha256_file, write_json
 
 
 @dataclass(slots=True)
@@ -18,25 +23,45 @@ class ExportSummary:
     packet_count: int
 
 
+# (path, mtime_ns, size) -> sha256
+_rgb_checksums: dict[tuple[str, int, int], str] = {}
+
+
+def _rgb_checksum(path: Path, stat: os.stat_result) -> str:
+    key = (str(path), stat.st_mtime_ns, stat.st_size)
+    checksum = _rgb_checksums.get(key)
+    if checksum is None:
+        checksum = _rgb_checksums[key] = sha256_file(path)
+    return checksum
+
+
+_CONTENT_TYPES = {".jpg": "image/jpeg", ".jpeg": "image/jpeg", ".png": "image/png"}
+
+
 def _content_type(path: Path) -> str:
-    suffix = path.suffix.lower()
-    if suffix in {".jpg", ".jpeg"}:
-        return "image/jpeg"
-    if suffix == ".png":
-        return "image/png"
-    return "application/octet-stream"
+    return _CONTENT_TYPES.get(path.suffix.lower(), "application/octet-stream")
 
 
-def _load_poses(session_dir: Path) -> list[TrajectoryPose]:
+def _load_poses_by_keyframe(session_dir: Path) -> dict[int, TrajectoryPose]:
     payload = read_json(session_dir / "meta" / "trajectory.json")
-    return [TrajectoryPose.from_dict(item) for item in payload["poses"]]  # type: ignore[index]
+    poses = (TrajectoryPose.from_trusted_dict(item) for item in payload["poses"])  # type: ignore[index]
+    return {pose.keyframe_index: pose for pose in poses}
 
 
+@cache
 def _load_schema() -> dict[str, object]:
     schema_path = Path(__file__).parent / "schemas" / "capture_packet.v1.schema.json"
     return json.loads(schema_path.read_text(encoding="utf-8"))
 
 
+@cache
+def _packet_validator() -> Validator:
+    schema = _load_schema()
+    validator_cls = validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema)
+
+
 def _build_packet(
     *,
     session_id: str,
@@ -46,6 +71,7 @@ def _build_packet(
     rgb_path: Path,
     capture_mode: str,
 ) -> dict[str, object]:
+    rgb_stat = rgb_path.stat()
     return {
         "schema_version": "v1",
         "session_id": session_id,
@@ -81,8 +107,8 @@ def _build_packet(
             "rgb": {
                 "uri": frame_record.relative_rgb_path,
                 "content_type": _content_type(rgb_path),
-                "checksum_sha256": sha256_file(rgb_path),
-                "size_bytes": rgb_path.stat().st_size,
+                "checksum_sha256": _rgb_checksum(rgb_path, rgb_stat),
+                "size_bytes": rgb_stat.st_size,
             }
         },
     }
@@ -93,11 +119,10 @@ def generate_capture_packets(
     session_dir: Path,
     capture_mode: str = "keyframes",
 ) -> ExportSummary:
-    schema = _load_schema()
+    validator = _packet_validator()
     frame_records = load_frame_records(session_dir)
     intrinsics = load_intrinsics(session_dir)
-    poses = _load_poses(session_dir)
-    pose_by_keyframe = {pose.keyframe_index: pose for pose in poses}
+    pose_by_keyframe = _load_poses_by_keyframe(session_dir)
 
     meta = read_json(session_dir / "meta" / "session.json")
     session_id = str(meta.get("session_id", session_dir.name))
@@ -105,8 +130,7 @@ def generate_capture_packets(
     packets_dir = session_dir / "exports" / "capture_packets"
     packets_dir.mkdir(parents=True, exist_ok=True)
 
-    packet_checksums: list[dict[str, object]] = []
-    for frame in frame_records:
+    def write_packet(frame: FrameRecord) -> dict[str, object]:
         rgb_path = session_dir / frame.relative_rgb_path
         pose = pose_by_keyframe.get(frame.keyframe_index)
         if pose is None:
@@ -125,25 +149,30 @@ def generate_capture_packets(
             rgb_path=rgb_path,
             capture_mode=capture_mode,
         )
-        validate(instance=packet, schema=schema)
+        validator.validate(packet)
 
         packet_path = packets_dir / f"{packet['packet_id']}.json"
-        write_json(packet_path, packet)
-        packet_checksums.append(
-            {
-                "packet_id": packet["packet_id"],
-                "file": str(packet_path.relative_to(session_dir)),
-                "checksum_sha256": sha256_file(packet_path),
-            }
-        )
-
+        data = dumps_json(packet)
+        packet_path.write_bytes(data)
+        return {
+            "packet_id": packet["packet_id"],
+            "file": str(packet_path.relative_to(session_dir)),
+            "checksum_sha256": hashlib.sha256(data).hexdigest(),
+        }
+
+    with ThreadPoolExecutor() as executor:
+        packet_checksums = list(executor.map(write_packet, frame_records))
+
+    reconstruction_dir = session_dir / "reconstruction"
+    try:
+        with os.scandir(reconstruction_dir) as entries:
+            present = {entry.name for entry in entries}
+    except FileNotFoundError:
+        present = set()
     artifacts: dict[str, str] = {}
-    pointcloud = session_dir / "reconstruction" / "pointcloud.ply"
-    mesh = session_dir / "reconstruction" / "mesh.glb"
-    if pointcloud.exists():
-        artifacts["pointcloud_ply"] = str(pointcloud.relative_to(session_dir))
-    if mesh.exists():
-        artifacts["mesh_glb"] = str(mesh.relative_to(session_dir))
+    for key, name in (("pointcloud_ply", "pointcloud.ply"), ("mesh_glb", "mesh.glb")):
+        if name in present:
+            artifacts[key] = str((reconstruction_dir / name).relative_to(session_dir))
 
     manifest_path = session_dir / "exports" / "manifest.json"
     write_json(
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import asdict, dataclass
+from typing import Any
 
 import numpy as np
 
@@ -76,8 +77,8 @@ class TrajectoryPose:
         return {
             "frame_index": self.frame_index,
             "keyframe_index": self.keyframe_index,
-            "translation_m": list(self.translation_m),
-            "quaternion_xyzw": list(self.quaternion_xyzw),
+            "translation_m": self.translation_m,
+            "quaternion_xyzw": self.quaternion_xyzw,
             "tracking_state": self.tracking_state,
             "pose_source": self.pose_source,
         }
@@ -94,3 +95,15 @@ class TrajectoryPose:
             tracking_state=str(value["tracking_state"]),
             pose_source=str(value.get("pose_source", "slam")),
         )
+
+    @classmethod
+    def from_trusted_dict(cls, value: dict[str, Any]) -> TrajectoryPose:
+        """Build from a trajectory this package wrote itself, skipping per-field coercion."""
+        return cls(
+            value["frame_index"],
+            value["keyframe_index"],
+            tuple(value["translation_m"]),  # type: ignore[arg-type]
+            tuple(value["quaternion_xyzw"]),  # type: ignore[arg-type]
+            value["tracking_state"],
+            value.get("pose_source", "slam"),
+        )
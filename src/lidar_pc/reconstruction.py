@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import partial
+from operator import attrgetter
 from pathlib import Path
 
 import cv2
 import numpy as np
 
-from lidar_pc.capture import load_frame_records, load_intrinsics
-from lidar_pc.models import TrajectoryPose
+from lidar_pc.capture import (
+    KeyframeFeatures,
+    detect_keyframe_features,
+    load_frame_records,
+    load_intrinsics,
+    read_keyframe_image,
+)
+from lidar_pc.models import FrameRecord, TrajectoryPose
 from lidar_pc.utils import (
+    ordered_map,
     quaternion_xyzw_to_rotation_matrix,
     read_json,
     write_json,
@@ -24,45 +33,68 @@ class ReconstructionSummary:
 
 def _load_poses(session_dir: Path) -> list[TrajectoryPose]:
     payload = read_json(session_dir / "meta" / "trajectory.json")
-    return [TrajectoryPose.from_dict(item) for item in payload["poses"]]  # type: ignore[index]
+    return [TrajectoryPose.from_trusted_dict(item) for item in payload["poses"]]  # type: ignore[index]
+
+
+_PLY_VERTEX_DTYPE = np.dtype(
+    [("x", "<f4"), ("y", "<f4"), ("z", "<f4"), ("red", "u1"), ("green", "u1"), ("blue", "u1")]
+)
 
 
-def _write_ascii_ply(path: Path, points: np.ndarray, colors: np.ndarray) -> None:
+def _write_ply(path: Path, points: np.ndarray, colors: np.ndarray, binary: bool = True) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
+    header = (
+        "ply\n"
+        f"format {'binary_little_endian' if binary else 'ascii'} 1.0\n"
+        f"element vertex {len(points)}\n"
+        "property float x\nproperty float y\nproperty float z\n"
+        "property uchar red\nproperty uchar green\nproperty uchar blue\n"
+        "end_header\n"
+    )
+    if binary:
+        vertices = np.empty(len(points), dtype=_PLY_VERTEX_DTYPE)
+        for axis, name in enumerate(("x", "y", "z")):
+            vertices[name] = points[:, axis]
+        for channel, name in enumerate(("red", "green", "blue")):
+            vertices[name] = colors[:, channel]
+        with path.open("wb") as handle:
+            handle.write(header.encode("ascii"))
+            handle.write(vertices.tobytes())
+        return
+
     with path.open("w", encoding="utf-8") as handle:
-        handle.write("ply\n")
-        handle.write("format ascii 1.0\n")
-        handle.write(f"element vertex {len(points)}\n")
-        handle.write("property float x\nproperty float y\nproperty float z\n")
-        handle.write("property uchar red\nproperty uchar green\nproperty uchar blue\n")
-        handle.write("end_header\n")
-        for point, color in zip(points, colors, strict=False):
-            handle.write(
-                f"{point[0]:.6f} {point[1]:.6f} {point[2]:.6f} "
-                f"{int(color[0])} {int(color[1])} {int(color[2])}\n"
-            )
+        handle.write(header)
+        np.savetxt(handle, np.hstack((points, colors)), fmt="%.6f %.6f %.6f %d %d %d")
+
+
+def _read_image(session_dir: Path, record: FrameRecord, downsample: bool) -> np.ndarray | None:
+    image = read_keyframe_image(session_dir, record)
+    if image is not None and downsample:
+        image = cv2.pyrDown(image)
+    return image
 
 
 def _triangulate_pair(
     img_1: np.ndarray,
-    img_2: np.ndarray,
+    features_1: KeyframeFeatures,
+    features_2: KeyframeFeatures,
     intrinsics: np.ndarray,
+    matcher: cv2.DescriptorMatcher,
     max_matches: int,
 ) -> tuple[np.ndarray, np.ndarray]:
-    orb = cv2.ORB_create(3000)
-    matcher = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
-
-    kp1, des1 = orb.detectAndCompute(img_1, None)
-    kp2, des2 = orb.detectAndCompute(img_2, None)
+    kp1, des1 = features_1
+    kp2, des2 = features_2
     if des1 is None or des2 is None or len(kp1) < 8 or len(kp2) < 8:
         return np.empty((0, 3), dtype=np.float64), np.empty((0, 3), dtype=np.uint8)
 
-    matches = sorted(matcher.match(des1, des2), key=lambda match: match.distance)[:max_matches]
+    matches = sorted(matcher.match(des1, des2), key=attrgetter("distance"))[:max_matches]
     if len(matches) < 8:
         return np.empty((0, 3), dtype=np.float64), np.empty((0, 3), dtype=np.uint8)
 
-    pts1 = np.float32([kp1[m.queryIdx].pt for m in matches])
-    pts2 = np.float32([kp2[m.trainIdx].pt for m in matches])
+    query = np.fromiter((m.queryIdx for m in matches), dtype=np.intp, count=len(matches))
+    train = np.fromiter((m.trainIdx for m in matches), dtype=np.intp, count=len(matches))
+    pts1 = cv2.KeyPoint_convert(kp1)[query]
+    pts2 = cv2.KeyPoint_convert(kp2)[train]
     essential, mask = cv2.findEssentialMat(pts1, pts2, intrinsics, method=cv2.RANSAC, threshold=1.0)
     if essential is None:
         return np.empty((0, 3), dtype=np.float64), np.empty((0, 3), dtype=np.uint8)
@@ -78,14 +110,12 @@ def _triangulate_pair(
     if len(xyz) == 0:
         return np.empty((0, 3), dtype=np.float64), np.empty((0, 3), dtype=np.uint8)
 
-    rgb = cv2.cvtColor(img_1, cv2.COLOR_GRAY2BGR)
-    colors: list[np.ndarray] = []
-    for point in pts1[valid]:
-        x = int(np.clip(round(point[0]), 0, rgb.shape[1] - 1))
-        y = int(np.clip(round(point[1]), 0, rgb.shape[0] - 1))
-        colors.append(rgb[y, x][::-1])  # RGB ordering
+    pixels = np.rint(pts1[valid]).astype(np.intp)
+    xs = np.clip(pixels[:, 0], 0, img_1.shape[1] - 1)
+    ys = np.clip(pixels[:, 1], 0, img_1.shape[0] - 1)
+    colors = np.repeat(img_1[ys, xs, None], 3, axis=1)
 
-    return xyz.astype(np.float64), np.asarray(colors, dtype=np.uint8)
+    return xyz.astype(np.float64), colors
 
 
 def run_reconstruction(*, session_dir: Path, quality: str = "high") -> ReconstructionSummary:
@@ -93,26 +123,38 @@ def run_reconstruction(*, session_dir: Path, quality: str = "high") -> Reconstru
     poses = _load_poses(session_dir)
     intrinsics = load_intrinsics(session_dir).matrix()
     max_matches = 1200 if quality == "high" else 500
+    # Intrinsics follow the half-resolution pixel grid.
+    downsample = quality != "high"
+    if downsample:
+        intrinsics[:2] *= 0.5
+
+    orb = cv2.ORB_create(3000)
+    matcher = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
 
     points_world: list[np.ndarray] = []
     colors_world: list[np.ndarray] = []
-    for idx in range(len(frame_records) - 1):
-        frame_a = frame_records[idx]
-        frame_b = frame_records[idx + 1]
-        image_a = cv2.imread(str(session_dir / frame_a.relative_rgb_path), cv2.IMREAD_GRAYSCALE)
-        image_b = cv2.imread(str(session_dir / frame_b.relative_rgb_path), cv2.IMREAD_GRAYSCALE)
-        if image_a is None or image_b is None:
+    images = ordered_map(
+        partial(_read_image, session_dir, downsample=downsample), frame_records, window=4
+    )
+    image_b: np.ndarray | None = None
+    features_b: KeyframeFeatures | None = None
+    for idx, image in enumerate(images):
+        image_a, features_a = image_b, features_b
+        image_b, features_b = image, detect_keyframe_features(orb, image)
+        if image_a is None or features_a is None or features_b is None:
             continue
 
-        points_local, colors_local = _triangulate_pair(image_a, image_b, intrinsics, max_matches)
-        if len(points_local) == 0:
+        pair_points, pair_colors = _triangulate_pair(
+            image_a, features_a, features_b, intrinsics, matcher, max_matches
+        )
+        if len(pair_points) == 0:
             continue
 
-        pose = poses[idx]
+        pose = poses[idx - 1]
         rotation = quaternion_xyzw_to_rotation_matrix(pose.quaternion_xyzw)
         translation = np.array(pose.translation_m, dtype=np.float64)
-        points_world.append((rotation @ points_local.T).T + translation)
-        colors_world.append(colors_local)
+        points_world.append((rotation @ pair_points.T).T + translation)
+        colors_world.append(pair_colors)
 
     if points_world:
         points = np.vstack(points_world)
@@ -137,13 +179,13 @@ def run_reconstruction(*, session_dir: Path, quality: str = "high") -> Reconstru
         points = np.asarray(cloud.points)
         colors = np.clip(np.asarray(cloud.colors) * 255.0, 0, 255).astype(np.uint8)
 
-        write_ok = o3d.io.write_point_cloud(str(pointcloud_path), cloud, write_ascii=True)
+        write_ok = o3d.io.write_point_cloud(str(pointcloud_path), cloud, write_ascii=False)
         if not write_ok:
-            _write_ascii_ply(pointcloud_path, points, colors)
+            _write_ply(pointcloud_path, points, colors)
     except ModuleNotFoundError:
-        _write_ascii_ply(pointcloud_path, points, colors)
+        _write_ply(pointcloud_path, points, colors)
     except Exception:
-        _write_ascii_ply(pointcloud_path, points, colors)
+        _write_ply(pointcloud_path, points, colors)
 
     try:
         import trimesh  # type: ignore[import-not-found]
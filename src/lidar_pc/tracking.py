@@ -1,14 +1,21 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import partial
+from operator import attrgetter
 from pathlib import Path
 
 import cv2
 import numpy as np
 
-from lidar_pc.capture import load_frame_records, load_intrinsics
+from lidar_pc.capture import (
+    detect_keyframe_features,
+    load_frame_records,
+    load_intrinsics,
+    read_keyframe_image,
+)
 from lidar_pc.models import TrajectoryPose
-from lidar_pc.utils import rotation_matrix_to_quaternion_xyzw, write_json
+from lidar_pc.utils import ordered_map, rotation_matrix_to_quaternion_xyzw, write_json
 
 
 @dataclass(slots=True)
@@ -41,6 +48,7 @@ def run_tracking(
 
     world_rotation = np.eye(3, dtype=np.float64)
     world_translation = np.zeros(3, dtype=np.float64)
+    world_quaternion = rotation_matrix_to_quaternion_xyzw(world_rotation)
     poses: list[TrajectoryPose] = [
         TrajectoryPose(
             frame_index=frame_records[0].frame_index,
@@ -51,53 +59,54 @@ def run_tracking(
         )
     ]
 
-    for idx in range(1, len(frame_records)):
-        previous = frame_records[idx - 1]
-        current = frame_records[idx]
-
-        prev_img = cv2.imread(str(session_dir / previous.relative_rgb_path), cv2.IMREAD_GRAYSCALE)
-        curr_img = cv2.imread(str(session_dir / current.relative_rgb_path), cv2.IMREAD_GRAYSCALE)
-        if prev_img is None or curr_img is None:
+    images = ordered_map(partial(read_keyframe_image, session_dir), frame_records, window=4)
+    curr_features = detect_keyframe_features(orb, next(images))
+    for current, image in zip(frame_records[1:], images, strict=True):
+        prev_features = curr_features
+        curr_features = detect_keyframe_features(orb, image)
+        if prev_features is None or curr_features is None:
             poses.append(
                 TrajectoryPose(
                     frame_index=current.frame_index,
                     keyframe_index=current.keyframe_index,
                     translation_m=tuple(world_translation.tolist()),
-                    quaternion_xyzw=rotation_matrix_to_quaternion_xyzw(world_rotation),
+                    quaternion_xyzw=world_quaternion,
                     tracking_state="lost",
                 )
             )
             continue
 
-        kp1, des1 = orb.detectAndCompute(prev_img, None)
-        kp2, des2 = orb.detectAndCompute(curr_img, None)
+        kp1, des1 = prev_features
+        kp2, des2 = curr_features
         if des1 is None or des2 is None or len(kp1) < 8 or len(kp2) < 8:
             poses.append(
                 TrajectoryPose(
                     frame_index=current.frame_index,
                     keyframe_index=current.keyframe_index,
                     translation_m=tuple(world_translation.tolist()),
-                    quaternion_xyzw=rotation_matrix_to_quaternion_xyzw(world_rotation),
+                    quaternion_xyzw=world_quaternion,
                     tracking_state="lost",
                 )
             )
             continue
 
-        matches = sorted(matcher.match(des1, des2), key=lambda match: match.distance)
+        matches = sorted(matcher.match(des1, des2), key=attrgetter("distance"))
         if len(matches) < 8:
             poses.append(
                 TrajectoryPose(
                     frame_index=current.frame_index,
                     keyframe_index=current.keyframe_index,
                     translation_m=tuple(world_translation.tolist()),
-                    quaternion_xyzw=rotation_matrix_to_quaternion_xyzw(world_rotation),
+                    quaternion_xyzw=world_quaternion,
                     tracking_state="lost",
                 )
             )
             continue
 
-        points_1 = np.float32([kp1[match.queryIdx].pt for match in matches])
-        points_2 = np.float32([kp2[match.trainIdx].pt for match in matches])
+        query = np.fromiter((m.queryIdx for m in matches), dtype=np.intp, count=len(matches))
+        train = np.fromiter((m.trainIdx for m in matches), dtype=np.intp, count=len(matches))
+        points_1 = cv2.KeyPoint_convert(kp1)[query]
+        points_2 = cv2.KeyPoint_convert(kp2)[train]
         essential, mask = cv2.findEssentialMat(
             points_1,
             points_2,
@@ -111,7 +120,7 @@ def run_tracking(
                     frame_index=current.frame_index,
                     keyframe_index=current.keyframe_index,
                     translation_m=tuple(world_translation.tolist()),
-                    quaternion_xyzw=rotation_matrix_to_quaternion_xyzw(world_rotation),
+                    quaternion_xyzw=world_quaternion,
                     tracking_state="lost",
                 )
             )
@@ -133,13 +142,14 @@ def run_tracking(
                 rel_t = rel_t / norm * step_scale_m
             world_translation = world_translation + world_rotation @ rel_t
             world_rotation = world_rotation @ rel_rotation
+            world_quaternion = rotation_matrix_to_quaternion_xyzw(world_rotation)
 
         poses.append(
             TrajectoryPose(
                 frame_index=current.frame_index,
                 keyframe_index=current.keyframe_index,
                 translation_m=tuple(float(v) for v in world_translation.tolist()),
-                quaternion_xyzw=rotation_matrix_to_quaternion_xyzw(world_rotation),
+                quaternion_xyzw=world_quaternion,
                 tracking_state=state,
             )
         )
@@ -2,12 +2,24 @@ from __future__ import annotations
 
 import hashlib
 import json
+import os
 import time
-from collections.abc import Iterable
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import TypeVar
 
 import numpy as np
 
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
 
 def now_wall_ms() -> int:
     return int(time.time() * 1000)
@@ -37,16 +49,44 @@ def allocate_session_dir(output_root: Path, session_id: str) -> Path:
 
 
 def sha256_file(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as handle:
-        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
-            digest.update(chunk)
-    return digest.hexdigest()
+    with path.open("rb", buffering=0) as handle:
+        return hashlib.file_digest(handle, "sha256").hexdigest()
+
+
+def ordered_map(
+    fn: Callable[[_T], _R],
+    items: Iterable[_T],
+    window: int | None = None,
+) -> Iterator[_R]:
+    """Like ``ThreadPoolExecutor.map`` but consumes ``items`` lazily.
+
+    Only ``window`` calls (default ``os.cpu_count()``) are in flight at once, so streaming
+    sources stay streaming. Results are yielded in input order; closing the iterator
+    early cancels calls that have not started.
+    """
+    window = window or os.cpu_count() or 4
+    executor = ThreadPoolExecutor(max_workers=window)
+    pending: deque[Future[_R]] = deque()
+    try:
+        for item in items:
+            pending.append(executor.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def dumps_json(payload: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    return json.dumps(payload, indent=2).encode("utf-8")
 
 
 def write_json(path: Path, payload: object) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    path.write_bytes(dumps_json(payload))
 
 
 def read_json(path: Path) -> dict[str, object]:
@@ -55,10 +95,11 @@ def read_json(path: Path) -> dict[str, object]:
 
 def write_jsonl(path: Path, rows: Iterable[dict[str, object]]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", encoding="utf-8") as handle:
-        for row in rows:
-            handle.write(json.dumps(row, separators=(",", ":")))
-            handle.write("\n")
+    if orjson is not None:
+        lines = [orjson.dumps(row) for row in rows]
+    else:
+        lines = [json.dumps(row, separators=(",", ":")).encode("utf-8") for row in rows]
+    path.write_bytes(b"\n".join(lines) + b"\n" if lines else b"")
 
 
 def read_jsonl(path: Path) -> list[dict[str, object]]:
@@ -72,34 +113,36 @@ def read_jsonl(path: Path) -> list[dict[str, object]]:
 
 
 def rotation_matrix_to_quaternion_xyzw(matrix: np.ndarray) -> tuple[float, float, float, float]:
-    m = matrix.astype(np.float64)
-    trace = float(np.trace(m))
+    (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = np.asarray(
+        matrix, dtype=np.float64
+    ).tolist()
+    trace = m00 + m11 + m22
     if trace > 0:
         s = (trace + 1.0) ** 0.5 * 2.0
         qw = 0.25 * s
-        qx = (m[2, 1] - m[1, 2]) / s
-        qy = (m[0, 2] - m[2, 0]) / s
-        qz = (m[1, 0] - m[0, 1]) / s
-    elif m[0, 0] > m[1, 1] and m[0, 0] > m[2, 2]:
-        s = (1.0 + m[0, 0] - m[1, 1] - m[2, 2]) ** 0.5 * 2.0
-        qw = (m[2, 1] - m[1, 2]) / s
+        qx = (m21 - m12) / s
+        qy = (m02 - m20) / s
+        qz = (m10 - m01) / s
+    elif m00 > m11 and m00 > m22:
+        s = (1.0 + m00 - m11 - m22) ** 0.5 * 2.0
+        qw = (m21 - m12) / s
         qx = 0.25 * s
-        qy = (m[0, 1] + m[1, 0]) / s
-        qz = (m[0, 2] + m[2, 0]) / s
-    elif m[1, 1] > m[2, 2]:
-        s = (1.0 + m[1, 1] - m[0, 0] - m[2, 2]) ** 0.5 * 2.0
-        qw = (m[0, 2] - m[2, 0]) / s
-        qx = (m[0, 1] + m[1, 0]) / s
+        qy = (m01 + m10) / s
+        qz = (m02 + m20) / s
+    elif m11 > m22:
+        s = (1.0 + m11 - m00 - m22) ** 0.5 * 2.0
+        qw = (m02 - m20) / s
+        qx = (m01 + m10) / s
         qy = 0.25 * s
-        qz = (m[1, 2] + m[2, 1]) / s
+        qz = (m12 + m21) / s
     else:
-        s = (1.0 + m[2, 2] - m[0, 0] - m[1, 1]) ** 0.5 * 2.0
-        qw = (m[1, 0] - m[0, 1]) / s
-        qx = (m[0, 2] + m[2, 0]) / s
-        qy = (m[1, 2] + m[2, 1]) / s
+        s = (1.0 + m22 - m00 - m11) ** 0.5 * 2.0
+        qw = (m10 - m01) / s
+        qx = (m02 + m20) / s
+        qy = (m12 + m21) / s
         qz = 0.25 * s
 
-    norm = float((qx * qx + qy * qy + qz * qz + qw * qw) ** 0.5)
+    norm = (qx * qx + qy * qy + qz * qz + qw * qw) ** 0.5
     if norm == 0.0:
         return (0.0, 0.0, 0.0, 1.0)
     return (qx / norm, qy / norm, qz / norm, qw / norm)
@@ -1,11 +1,19 @@
 from __future__ import annotations
 
+import contextlib
+import ctypes
 import os
 import platform
 import re
+import select
 import subprocess
+import sys
 import time
+from collections.abc import Sequence
+from collections.abc import Set as AbstractSet
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import cache
 from pathlib import Path
 
 
@@ -16,13 +24,15 @@ class UsbIpDevice:
     state: str
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class WslCameraFixResult:
     attempted: bool
     success: bool
-    messages: list[str]
-    linux_video_devices: list[str]
-    matched_busids: list[str]
+    messages: Sequence[str]
+    linux_video_devices: Sequence[str]
+    matched_busids: Sequence[str]
+    # Stable outcome tags, e.g. "usbipd_missing".
+    events: AbstractSet[str] = frozenset()
 
 
 _CAMERA_KEYWORDS = (
@@ -35,7 +45,38 @@ _CAMERA_KEYWORDS = (
 )
 
 
+_ON_LINUX = sys.platform.startswith("linux")
+_CAMERA_RE = re.compile("|".join(map(re.escape, _CAMERA_KEYWORDS)), re.IGNORECASE)
+# "Connected" rows only: BUSID, VID:PID, description, state; "Persisted" rows have no VID:PID.
+_USBIPD_LINE_RE = re.compile(
+    r"^[ \t]*(?P<busid>[0-9][0-9-]*)[ \t]+"
+    r"[0-9a-fA-F]{4}:[0-9a-fA-F]{4}[ \t]+"
+    r"(?P<description>\S.*?)[ \t]{2,}"
+    r"(?P<state>\S+(?: \S+)*)[ \t\r]*$",
+    re.MULTILINE,
+)
+_COLUMN_GAP_RE = re.compile(r"\s{2,}")
+_IN_CREATE = 0x100
+_USBIPD_LIST_TTL_S = 3.0
+_POLL_INITIAL_S = 0.05
+_POLL_MAX_S = 0.5
+# PowerShell's error for an unknown command; 127 comes from a missing powershell.exe.
+_COMMAND_NOT_FOUND_MARKERS = ("commandnotfoundexception", "is not recognized")
+_WSL_INTEROP_PATHS = (
+    "/proc/sys/fs/binfmt_misc/WSLInterop",
+    "/proc/sys/fs/binfmt_misc/WSLInterop-late",
+)
+
+# Cleared whenever a bind or attach changes device state.
+_powershell_cache: dict[str, tuple[float, tuple[int, str, str]]] = {}
+
+
+@cache
 def is_wsl_environment() -> bool:
+    if not _ON_LINUX:
+        return False
+    if _current_wsl_distro_name() or any(os.path.exists(path) for path in _WSL_INTEROP_PATHS):
+        return True
     release = platform.release().lower()
     if "microsoft" in release or "wsl" in release:
         return True
@@ -46,37 +87,47 @@ def is_wsl_environment() -> bool:
 
 
 def list_linux_video_devices() -> list[str]:
-    if not Path("/dev").exists():
+    try:
+        with os.scandir("/dev") as entries:
+            return sorted(entry.path for entry in entries if entry.name.startswith("video"))
+    except OSError:
         return []
-    return sorted(str(path) for path in Path("/dev").glob("video*"))
+
+
+def _open_dev_watch() -> int | None:
+    """Return an inotify descriptor watching /dev for new nodes, or None if unavailable."""
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (AttributeError, OSError, TypeError):
+        return None
+    if fd < 0:
+        return None
+    if libc.inotify_add_watch(fd, b"/dev", _IN_CREATE) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+def _wait_for_dev_change(watch_fd: int | None, timeout_s: float, poll_s: float) -> None:
+    if watch_fd is None:
+        time.sleep(min(timeout_s, poll_s))
+        return
+    readable, _, _ = select.select([watch_fd], [], [], timeout_s)
+    if readable:
+        with contextlib.suppress(BlockingIOError):
+            os.read(watch_fd, 4096)
 
 
 def parse_usbipd_list(output: str) -> list[UsbIpDevice]:
-    devices: list[UsbIpDevice] = []
-    for raw_line in output.splitlines():
-        line = raw_line.strip()
-        if not line:
-            continue
-        if line.lower().startswith("busid") or line.startswith("-"):
-            continue
-        if not re.match(r"^[0-9-]+", line):
-            continue
-
-        first_split = re.split(r"\s+", line, maxsplit=2)
-        if len(first_split) < 3:
-            continue
-
-        busid = first_split[0]
-        rest = first_split[2].strip()
-        parts = re.split(r"\s{2,}", rest)
-        if len(parts) < 2:
-            continue
-
-        description = " ".join(parts[:-1]).strip()
-        state = parts[-1].strip()
-        if description:
-            devices.append(UsbIpDevice(busid=busid, description=description, state=state))
-    return devices
+    return [
+        UsbIpDevice(
+            busid=match["busid"],
+            description=_COLUMN_GAP_RE.sub(" ", match["description"]),
+            state=match["state"],
+        )
+        for match in _USBIPD_LINE_RE.finditer(output)
+    ]
 
 
 def _run_windows_powershell(command: str, timeout_s: int = 60) -> tuple[int, str, str]:
@@ -95,6 +146,18 @@ def _run_windows_powershell(command: str, timeout_s: int = 60) -> tuple[int, str
     return (completed.returncode, completed.stdout.strip(), completed.stderr.strip())
 
 
+def _run_cached_powershell(command: str, ttl_s: float) -> tuple[int, str, str]:
+    """Reuse a recent successful result of an idempotent command (e.g. ``usbipd list``)."""
+    now = time.monotonic()
+    cached = _powershell_cache.get(command)
+    if cached is not None and now - cached[0] < ttl_s:
+        return cached[1]
+    result = _run_windows_powershell(command)
+    if result[0] == 0:
+        _powershell_cache[command] = (now, result)
+    return result
+
+
 def _is_wsl_vsock_bridge_error(text: str) -> bool:
     lowered = text.lower()
     return "utilbindvsockanyport" in lowered or (
@@ -102,6 +165,11 @@ def _is_wsl_vsock_bridge_error(text: str) -> bool:
     )
 
 
+def _is_usbipd_missing(returncode: int, stderr: str) -> bool:
+    lowered = stderr.lower()
+    return returncode == 127 or any(marker in lowered for marker in _COMMAND_NOT_FOUND_MARKERS)
+
+
 def _current_wsl_distro_name() -> str | None:
     value = os.environ.get("WSL_DISTRO_NAME", "").strip()
     return value or None
@@ -119,12 +187,7 @@ def _find_candidate_busids(devices: list[UsbIpDevice], requested_busid: str | No
     if requested_busid:
         return [requested_busid]
 
-    candidates: list[str] = []
-    for device in devices:
-        desc = device.description.lower()
-        if any(keyword in desc for keyword in _CAMERA_KEYWORDS):
-            candidates.append(device.busid)
-    return candidates
+    return [device.busid for device in devices if _CAMERA_RE.search(device.description)]
 
 
 def _device_for_busid(devices: list[UsbIpDevice], busid: str) -> UsbIpDevice | None:
@@ -141,12 +204,14 @@ def _state_indicates_shared_or_attached(state: str) -> bool:
     return "shared" in lowered or "attach" in lowered
 
 
-def _attempt_usbipd_attach(busid: str) -> tuple[bool, list[str]]:
+def _attempt_usbipd_attach(busid: str, events: set[str]) -> tuple[bool, list[str]]:
     messages: list[str] = []
     attach_commands = _candidate_attach_commands(busid)
     for attach_idx, attach_command in enumerate(attach_commands):
         attach_rc, attach_out, attach_err = _run_windows_powershell(attach_command)
         if attach_rc == 0:
+            _powershell_cache.clear()
+            events.add("attach_success")
             if attach_idx > 0:
                 messages.append("attach succeeded after retrying with explicit WSL distro name")
             return True, messages
@@ -154,6 +219,7 @@ def _attempt_usbipd_attach(busid: str) -> tuple[bool, list[str]]:
         details = attach_err or attach_out or "unknown error"
         messages.append(f"attach failed for {busid}: {details}")
         if attach_idx + 1 < len(attach_commands):
+            events.add("retry_with_distro")
             messages.append(
                 "retrying attach with explicit distro: "
                 f"{attach_commands[attach_idx + 1]}"
@@ -161,12 +227,90 @@ def _attempt_usbipd_attach(busid: str) -> tuple[bool, list[str]]:
     return False, messages
 
 
+def _fix_busid(
+    busid: str,
+    device: UsbIpDevice | None,
+    allow_bind: bool,
+) -> tuple[list[str], set[str]]:
+    state_text = f" ({device.state})" if device else ""
+    messages = [f"attempting usbipd attach for {busid}{state_text}"]
+    events: set[str] = set()
+
+    attached, attach_messages = _attempt_usbipd_attach(busid, events)
+    messages.extend(attach_messages)
+    if attached:
+        return messages, events
+
+    already_shared = bool(device and _state_indicates_shared_or_attached(device.state))
+    if already_shared:
+        events.add("bind_skipped_shared")
+        messages.append(
+            f"{busid} is already shared/attached; skipping bind retry to avoid admin-only step"
+        )
+        return messages, events
+
+    if not allow_bind:
+        events.add("bind_disabled")
+        messages.append(f"{busid} is not shared and bind retry is disabled (allow_bind=False)")
+        return messages, events
+
+    messages.append(f"attempting usbipd bind for {busid} (may require Administrator)")
+    bind_rc, bind_out, bind_err = _run_windows_powershell(f"usbipd bind --busid {busid}")
+    if bind_rc != 0:
+        events.add("bind_failed")
+        messages.append(f"bind failed for {busid}: {bind_err or bind_out or 'unknown error'}")
+        return messages, events
+    _powershell_cache.clear()
+
+    attached, attach_messages = _attempt_usbipd_attach(busid, events)
+    messages.extend(attach_messages)
+    if attached:
+        events.add("attach_after_bind")
+        messages.append("camera attach succeeded after bind")
+    return messages, events
+
+
+_NOT_WSL_RESULT = WslCameraFixResult(
+    attempted=False,
+    success=False,
+    messages=("not running in WSL; passthrough helper is skipped",),
+    linux_video_devices=(),
+    matched_busids=(),
+    events=frozenset({"not_wsl"}),
+)
+_NO_USBIPD_DEVICES_RESULT = WslCameraFixResult(
+    attempted=True,
+    success=False,
+    messages=(
+        "usbipd returned no attachable USB devices.",
+        "If you use an integrated laptop camera, WSL passthrough may not be available.",
+    ),
+    linux_video_devices=(),
+    matched_busids=(),
+    events=frozenset({"no_usbipd_devices"}),
+)
+_NO_CAMERA_CANDIDATES_RESULT = WslCameraFixResult(
+    attempted=True,
+    success=False,
+    messages=(
+        "no camera-like USB device found in usbipd list",
+        "plug in a USB camera/depth camera and retry",
+    ),
+    linux_video_devices=(),
+    matched_busids=(),
+    events=frozenset({"no_camera_candidates"}),
+)
+
+
 def attempt_wsl_camera_fix(
     *,
     requested_busid: str | None = None,
     max_wait_s: float = 6.0,
     allow_bind: bool = False,
 ) -> WslCameraFixResult:
+    if not _ON_LINUX:
+        return _NOT_WSL_RESULT
+
     messages: list[str] = []
     initial_devices = list_linux_video_devices()
     if initial_devices:
@@ -176,42 +320,37 @@ def attempt_wsl_camera_fix(
             messages=["linux camera device already present; no passthrough needed"],
             linux_video_devices=initial_devices,
             matched_busids=[],
+            events=frozenset({"device_present"}),
         )
 
     if not is_wsl_environment():
-        return WslCameraFixResult(
-            attempted=False,
-            success=False,
-            messages=["not running in WSL; passthrough helper is skipped"],
-            linux_video_devices=[],
-            matched_busids=[],
-        )
-
-    rc, _, err = _run_windows_powershell("Get-Command usbipd -ErrorAction SilentlyContinue")
-    if rc != 0:
-        details = err or "Get-Command usbipd failed"
-        bridge_recovery = None
-        if _is_wsl_vsock_bridge_error(details):
-            bridge_recovery = (
+        return _NOT_WSL_RESULT
+
+    rc, out, err = _run_cached_powershell("usbipd list", _USBIPD_LIST_TTL_S)
+    bridge_error = rc != 0 and _is_wsl_vsock_bridge_error(err)
+    usbipd_missing = rc != 0 and _is_usbipd_missing(rc, err)
+    events: set[str] = set()
+    if bridge_error or usbipd_missing:
+        if usbipd_missing:
+            events.add("usbipd_missing")
+            messages.append("usbipd is not available on Windows host.")
+            messages.append("Install usbipd-win on Windows and retry.")
+        if bridge_error:
+            events.add("vsock_bridge_error")
+            messages.append(
                 "WSL-to-Windows bridge is unavailable (vsock error). "
                 "Run 'wsl --shutdown' in Windows PowerShell, reopen WSL, and retry."
             )
-        messages = [
-            "usbipd is not available on Windows host.",
-            "Install usbipd-win on Windows and retry.",
-        ]
-        if bridge_recovery:
-            messages.append(bridge_recovery)
-        messages.append(f"details: {details}")
+        messages.append(f"details: {err or 'usbipd list failed'}")
         return WslCameraFixResult(
             attempted=False,
             success=False,
             messages=messages,
             linux_video_devices=[],
             matched_busids=[],
+            events=events,
         )
 
-    rc, out, err = _run_windows_powershell("usbipd list")
     if rc != 0:
         return WslCameraFixResult(
             attempted=True,
@@ -222,80 +361,46 @@ def attempt_wsl_camera_fix(
             ],
             linux_video_devices=[],
             matched_busids=[],
+            events=frozenset({"list_failed"}),
         )
 
     devices = parse_usbipd_list(out)
     if not devices:
-        return WslCameraFixResult(
-            attempted=True,
-            success=False,
-            messages=[
-                "usbipd returned no attachable USB devices.",
-                "If you use an integrated laptop camera, WSL passthrough may not be available.",
-            ],
-            linux_video_devices=[],
-            matched_busids=[],
-        )
+        return _NO_USBIPD_DEVICES_RESULT
 
     busids = _find_candidate_busids(devices, requested_busid=requested_busid)
     if not busids:
-        return WslCameraFixResult(
-            attempted=True,
-            success=False,
-            messages=[
-                "no camera-like USB device found in usbipd list",
-                "plug in a USB camera/depth camera and retry",
-            ],
-            linux_video_devices=[],
-            matched_busids=[],
-        )
-
-    for busid in busids:
-        device = _device_for_busid(devices, busid)
-        state_text = f" ({device.state})" if device else ""
-        messages.append(f"attempting usbipd attach for {busid}{state_text}")
-
-        attached, attach_messages = _attempt_usbipd_attach(busid)
-        messages.extend(attach_messages)
-        if attached:
-            continue
-
-        already_shared = bool(device and _state_indicates_shared_or_attached(device.state))
-        if already_shared:
-            messages.append(
-                f"{busid} is already shared/attached; skipping bind retry to avoid admin-only step"
-            )
-            continue
-
-        if not allow_bind:
-            messages.append(
-                f"{busid} is not shared and bind retry is disabled (allow_bind=False)"
-            )
-            continue
-
-        messages.append(f"attempting usbipd bind for {busid} (may require Administrator)")
-        bind_rc, bind_out, bind_err = _run_windows_powershell(f"usbipd bind --busid {busid}")
-        if bind_rc != 0:
-            messages.append(f"bind failed for {busid}: {bind_err or bind_out or 'unknown error'}")
-            continue
-
-        attached, attach_messages = _attempt_usbipd_attach(busid)
-        messages.extend(attach_messages)
-        if attached:
-            messages.append("camera attach succeeded after bind")
-
-    deadline = time.time() + max_wait_s
-    while time.time() < deadline:
-        present = list_linux_video_devices()
-        if present:
-            return WslCameraFixResult(
-                attempted=True,
-                success=True,
-                messages=messages + ["camera device detected after usbipd attach"],
-                linux_video_devices=present,
-                matched_busids=busids,
-            )
-        time.sleep(0.5)
+        return _NO_CAMERA_CANDIDATES_RESULT
+
+    with ThreadPoolExecutor(max_workers=min(len(busids), 4)) as executor:
+        for busid_messages, busid_events in executor.map(
+            lambda busid: _fix_busid(busid, _device_for_busid(devices, busid), allow_bind),
+            busids,
+        ):
+            messages.extend(busid_messages)
+            events |= busid_events
+
+    # Opened before the first re-list, so a node created in between still wakes the wait.
+    watch_fd = _open_dev_watch()
+    try:
+        deadline = time.monotonic() + max_wait_s
+        poll_s = _POLL_INITIAL_S
+        while (remaining := deadline - time.monotonic()) > 0:
+            present = list_linux_video_devices()
+            if present:
+                return WslCameraFixResult(
+                    attempted=True,
+                    success=True,
+                    messages=messages + ["camera device detected after usbipd attach"],
+                    linux_video_devices=present,
+                    matched_busids=busids,
+                    events=events | {"device_detected"},
+                )
+            _wait_for_dev_change(watch_fd, remaining, poll_s)
+            poll_s = min(poll_s * 2, _POLL_MAX_S)
+    finally:
+        if watch_fd is not None:
+            os.close(watch_fd)
 
     messages.append(
         "camera still unavailable after attach attempts. "
@@ -308,4 +413,5 @@ def attempt_wsl_camera_fix(
         messages=messages,
         linux_video_devices=[],
         matched_busids=busids,
+        events=events | {"device_timeout"},
     )
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+
+from lidar_pc.capture import _camera_frame, _is_jpeg_buffer, _stream_camera, capture_session
+
+
+def test_capture_copies_jpeg_inputs_without_reencoding(tmp_path: Path) -> None:
+    inputs = tmp_path / "inputs"
+    inputs.mkdir()
+    rng = np.random.default_rng(11)
+    image = rng.integers(0, 255, size=(120, 160, 3), dtype=np.uint8)
+    cv2.imwrite(str(inputs / "img_00.jpg"), image)
+
+    summary = capture_session(
+        session_id="copy",
+        output_root=tmp_path / "outputs",
+        capture_mode="full_stream",
+        input_glob=str(inputs / "*.jpg"),
+    )
+
+    assert summary.keyframes == 1
+    written = summary.session_dir / "rgb" / "frame_000000.jpg"
+    assert written.read_bytes() == (inputs / "img_00.jpg").read_bytes()
+
+
+def _jpeg_row(image: np.ndarray) -> np.ndarray:
+    ok, encoded = cv2.imencode(".jpg", image)
+    assert ok
+    return encoded.reshape(1, -1)
+
+
+def test_camera_frame_decodes_jpeg_row_buffer() -> None:
+    image = np.full((24, 32, 3), 128, dtype=np.uint8)
+    buffer = _jpeg_row(image)
+
+    assert _is_jpeg_buffer(buffer)
+    frame = _camera_frame(buffer, raw_jpeg=True)
+    assert frame is not None
+    assert frame.image.shape == (24, 32)
+    assert frame.jpeg == buffer.tobytes()
+
+
+def test_camera_frame_accepts_decoded_bgr_fallback() -> None:
+    image = np.zeros((24, 32, 3), dtype=np.uint8)
+
+    assert not _is_jpeg_buffer(image)
+    frame = _camera_frame(image, raw_jpeg=True)
+    assert frame is not None
+    assert frame.image is image
+    assert frame.jpeg is None
+
+
+def test_camera_frame_rejects_garbage_buffer() -> None:
+    garbage = np.arange(1, 65, dtype=np.uint8).reshape(1, -1)
+
+    assert not _is_jpeg_buffer(garbage)
+    assert _camera_frame(garbage, raw_jpeg=True) is None
+
+
+class _FakeCapture:
+    def __init__(self, buffers: list[np.ndarray]) -> None:
+        self._buffers = buffers
+        self.convert_rgb: float | None = None
+
+    def read(self) -> tuple[bool, np.ndarray]:
+        # The last buffer repeats forever, like a camera stuck in one format.
+        buffer = self._buffers.pop(0) if len(self._buffers) > 1 else self._buffers[0]
+        return True, buffer
+
+    def set(self, prop: int, value: float) -> bool:
+        if prop == cv2.CAP_PROP_CONVERT_RGB:
+            self.convert_rgb = value
+        return True
+
+    def release(self) -> None:
+        pass
+
+
+def test_stream_camera_falls_back_to_bgr_on_raw_yuv_buffers() -> None:
+    yuy2 = np.zeros((24, 32, 2), dtype=np.uint8)
+    bgr = np.zeros((24, 32, 3), dtype=np.uint8)
+    cap = _FakeCapture([yuy2, bgr])
+
+    frames = list(_stream_camera(cap, max_frames=3, duration_s=None, raw_jpeg=True))
+
+    assert cap.convert_rgb == 1
+    assert len(frames) == 3
+    assert all(frame.jpeg is None for frame in frames)
+
+
+def test_stream_camera_raises_on_undecodable_jpeg_stream() -> None:
+    corrupt = np.array([[0xFF, 0xD8, 0xFF, 0x00, 0x01, 0x02]], dtype=np.uint8)
+    cap = _FakeCapture([corrupt])
+
+    with pytest.raises(RuntimeError, match="undecodable"):
+        list(_stream_camera(cap, max_frames=1, duration_s=None, raw_jpeg=True))
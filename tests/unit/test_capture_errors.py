@@ -22,6 +22,15 @@ def test_capture_from_files_error_includes_pattern_and_cwd(
     assert f"cwd={tmp_path}" in message
 
 
+def test_capture_from_files_reports_unreadable_images(tmp_path: Path) -> None:
+    (tmp_path / "broken.jpg").write_bytes(b"not a jpeg")
+    frames = _capture_from_files(str(tmp_path / "*.jpg"), max_frames=10)
+    with pytest.raises(RuntimeError) as excinfo:
+        list(frames)
+
+    assert "No readable input images were found" in str(excinfo.value)
+
+
 def test_calibrate_camera_error_reports_found_count(tmp_path: Path) -> None:
     # Create valid image files that intentionally do not contain a checkerboard.
     for index in range(3):
@@ -7,7 +7,7 @@ import cv2
 import numpy as np
 
 from lidar_pc.exporter import generate_capture_packets
-from lidar_pc.utils import write_json, write_jsonl
+from lidar_pc.utils import dumps_json, sha256_file, write_json, write_jsonl
 
 
 def _make_session(tmp_path: Path) -> Path:
@@ -84,3 +84,34 @@ def test_generate_capture_packets(tmp_path: Path) -> None:
     assert packet["payloads"]["rgb"]["content_type"] == "image/jpeg"
     assert len(packet["payloads"]["rgb"]["checksum_sha256"]) == 64
 
+
+def test_manifest_checksums_match_packet_files(tmp_path: Path) -> None:
+    session = _make_session(tmp_path)
+    summary = generate_capture_packets(session_dir=session, capture_mode="keyframes")
+
+    manifest = json.loads(summary.manifest_path.read_text(encoding="utf-8"))
+    for entry in manifest["packets"]:
+        assert entry["checksum_sha256"] == sha256_file(session / entry["file"])
+
+
+def test_packet_files_use_shared_json_format(tmp_path: Path) -> None:
+    session = _make_session(tmp_path)
+    summary = generate_capture_packets(session_dir=session, capture_mode="keyframes")
+
+    data = (summary.packets_dir / "pkt_00000.json").read_bytes()
+    assert data == dumps_json(json.loads(data))
+
+
+def test_manifest_lists_existing_artifacts(tmp_path: Path) -> None:
+    session = _make_session(tmp_path)
+    summary = generate_capture_packets(session_dir=session, capture_mode="keyframes")
+    manifest = json.loads(summary.manifest_path.read_text(encoding="utf-8"))
+    assert manifest["artifacts"] == {}
+
+    (session / "reconstruction").mkdir()
+    (session / "reconstruction" / "pointcloud.ply").write_bytes(b"ply\n")
+    summary = generate_capture_packets(session_dir=session, capture_mode="keyframes")
+    manifest = json.loads(summary.manifest_path.read_text(encoding="utf-8"))
+    assert manifest["artifacts"] == {
+        "pointcloud_ply": str(Path("reconstruction") / "pointcloud.ply")
+    }
@@ -1,8 +1,16 @@
 from __future__ import annotations
 
+import cv2
 import numpy as np
+import pytest
 
-from lidar_pc.capture import should_keep_keyframe
+from lidar_pc.capture import (
+    _mean_abs_diff,
+    keyframe_gray,
+    should_keep_keyframe,
+    variance_of_laplacian,
+)
+from lidar_pc.config import CaptureConfig
 
 
 def test_first_frame_is_kept() -> None:
@@ -45,3 +53,63 @@ def test_accepts_motion_on_interval() -> None:
         blur_threshold=20.0,
     )
 
+
+def test_rejects_motion_off_interval() -> None:
+    prev = np.zeros((32, 32), dtype=np.uint8)
+    curr = np.full((32, 32), 255, dtype=np.uint8)
+    assert not should_keep_keyframe(
+        prev_gray=prev,
+        current_gray=curr,
+        frame_index=5,
+        frame_interval=4,
+        pixel_delta_threshold=5.0,
+        blur_score=80.0,
+        blur_threshold=20.0,
+    )
+
+
+def test_blur_score_ranks_sharp_above_blurred() -> None:
+    rng = np.random.default_rng(7)
+    sharp = rng.integers(0, 255, size=(120, 160), dtype=np.uint8)
+    blurred = cv2.GaussianBlur(sharp, (0, 0), 3.0)
+    assert variance_of_laplacian(sharp) > variance_of_laplacian(blurred)
+
+
+def test_keyframe_gray_is_single_channel_half_resolution() -> None:
+    frame = np.zeros((240, 320, 3), dtype=np.uint8)
+    gray = keyframe_gray(frame)
+    assert gray.shape == (120, 160)
+    assert gray.dtype == np.uint8
+
+
+def test_opencl_path_matches_host_scores() -> None:
+    rng = np.random.default_rng(3)
+    first = rng.integers(0, 255, size=(120, 160, 3), dtype=np.uint8)
+    second = cv2.GaussianBlur(first, (0, 0), 2.0)
+
+    host = [keyframe_gray(first), keyframe_gray(second)]
+    device = [keyframe_gray(first, use_opencl=True), keyframe_gray(second, use_opencl=True)]
+
+    assert variance_of_laplacian(device[0]) == pytest.approx(variance_of_laplacian(host[0]))
+    assert _mean_abs_diff(device[0], device[1]) == pytest.approx(_mean_abs_diff(host[0], host[1]))
+
+
+@pytest.mark.parametrize(("sigma", "rectangles"), [(0.6, 40), (1.0, 8)])
+def test_mildly_blurred_frame_passes_default_threshold(sigma: float, rectangles: int) -> None:
+    # 720p scene with hard edges, mild optical blur, sensor noise and JPEG q90.
+    rng = np.random.default_rng(11)
+    scene = cv2.resize(
+        rng.random((45, 80), dtype=np.float32) * 255, (1280, 720), interpolation=cv2.INTER_CUBIC
+    )
+    for _ in range(rectangles):
+        x, y = rng.integers(0, 1200, size=2) % (1200, 680)
+        w, h = rng.integers(20, 300, size=2)
+        cv2.rectangle(scene, (int(x), int(y)), (int(x + w), int(y + h)), int(rng.integers(256)), -1)
+    frame = cv2.GaussianBlur(scene, (0, 0), sigma) + rng.normal(0, 3.0, scene.shape)
+    _, jpeg = cv2.imencode(
+        ".jpg", np.clip(frame, 0, 255).astype(np.uint8), [cv2.IMWRITE_JPEG_QUALITY, 90]
+    )
+    decoded = cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+
+    score = variance_of_laplacian(keyframe_gray(decoded))
+    assert score > CaptureConfig().keyframe_blur_threshold
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from lidar_pc.models import TrajectoryPose
+
+
+def test_trajectory_pose_trusted_dict_matches_from_dict() -> None:
+    pose = TrajectoryPose(
+        frame_index=3,
+        keyframe_index=1,
+        translation_m=(0.1, -0.2, 0.3),
+        quaternion_xyzw=(0.0, 0.0, 0.0, 1.0),
+        tracking_state="good",
+    )
+    payload = pose.to_dict()
+    assert TrajectoryPose.from_trusted_dict(payload) == pose
+    assert TrajectoryPose.from_dict(payload) == pose
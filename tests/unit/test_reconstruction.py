@@ -9,7 +9,7 @@ import numpy as np
 import pytest
 
 from lidar_pc.capture import capture_session
-from lidar_pc.reconstruction import run_reconstruction
+from lidar_pc.reconstruction import _write_ply, run_reconstruction
 from lidar_pc.tracking import run_tracking
 
 
@@ -23,7 +23,7 @@ def _generate_input_images(path: Path, count: int = 8) -> None:
         cv2.imwrite(str(path / f"img_{index:02d}.jpg"), shifted)
 
 
-def test_reconstruction_falls_back_to_ascii_ply_when_open3d_write_fails(
+def test_reconstruction_falls_back_to_ply_writer_when_open3d_write_fails(
     tmp_path: Path,
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -64,4 +64,43 @@ def test_reconstruction_falls_back_to_ascii_ply_when_open3d_write_fails(
     reconstruction = run_reconstruction(session_dir=capture.session_dir, quality="high")
     assert reconstruction.pointcloud_path.exists()
     assert reconstruction.point_count > 0
-    assert reconstruction.pointcloud_path.read_text(encoding="utf-8").startswith("ply\n")
+    assert reconstruction.pointcloud_path.read_bytes().startswith(
+        b"ply\nformat binary_little_endian 1.0\n"
+    )
+
+
+def test_medium_quality_triangulates_at_half_resolution(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    inputs = tmp_path / "inputs"
+    _generate_input_images(inputs)
+    capture = capture_session(
+        session_id="demo",
+        output_root=tmp_path / "outputs",
+        capture_mode="keyframes",
+        frame_interval=1,
+        blur_threshold=0.0,
+        pixel_delta_threshold=0.0,
+        max_frames=20,
+        input_glob=str(inputs / "*.jpg"),
+    )
+    run_tracking(session_dir=capture.session_dir, min_inliers=8, step_scale_m=0.1)
+    monkeypatch.setitem(sys.modules, "open3d", None)
+
+    reconstruction = run_reconstruction(session_dir=capture.session_dir, quality="medium")
+    # More points than the one-per-pose fallback means pairs were actually triangulated.
+    assert reconstruction.point_count > capture.keyframes
+
+
+def test_write_ply_ascii_rows(tmp_path: Path) -> None:
+    path = tmp_path / "cloud.ply"
+    points = np.array([[0.5, -1.0, 2.25], [1.0, 2.0, 3.0]], dtype=np.float64)
+    colors = np.array([[255, 0, 10], [1, 2, 3]], dtype=np.uint8)
+    _write_ply(path, points, colors, binary=False)
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert lines[2] == "element vertex 2"
+    assert lines[-2:] == [
+        "0.500000 -1.000000 2.250000 255 0 10",
+        "1.000000 2.000000 3.000000 1 2 3",
+    ]
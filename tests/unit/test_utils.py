@@ -2,7 +2,20 @@ from __future__ import annotations
 
 from pathlib import Path
 
-from lidar_pc.utils import allocate_session_dir, sha256_file
+import numpy as np
+import pytest
+
+from lidar_pc import utils
+from lidar_pc.utils import (
+    allocate_session_dir,
+    quaternion_xyzw_to_rotation_matrix,
+    read_json,
+    read_jsonl,
+    rotation_matrix_to_quaternion_xyzw,
+    sha256_file,
+    write_json,
+    write_jsonl,
+)
 
 
 def test_sha256_file(tmp_path: Path) -> None:
@@ -20,3 +33,41 @@ def test_allocate_session_dir_creates_suffix(tmp_path: Path) -> None:
     (first / "x.txt").write_text("x", encoding="utf-8")
     second = allocate_session_dir(tmp_path, "run")
     assert second.name == "run_run02"
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_writers_round_trip(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    use_orjson: bool,
+) -> None:
+    if not use_orjson:
+        monkeypatch.setattr(utils, "orjson", None)
+    elif utils.orjson is None:
+        pytest.skip("orjson not installed")
+    rows = [{"frame_index": 0, "blur_score": 1.5}, {"frame_index": 1, "path": "rgb/a.jpg"}]
+    path = tmp_path / "meta" / "frames.jsonl"
+    write_jsonl(path, rows)
+    assert path.read_text(encoding="utf-8").count("\n") == 2
+    assert read_jsonl(path) == rows
+
+    payload = {"schema_version": "v1", "poses": rows, "metrics": {"good_ratio": 0.5}}
+    write_json(path.with_suffix(".json"), payload)
+    assert read_json(path.with_suffix(".json")) == payload
+
+
+@pytest.mark.parametrize(
+    "quat",
+    [
+        (0.0, 0.0, 0.0, 1.0),
+        (0.9, 0.1, -0.2, 0.05),
+        (0.1, 0.95, 0.2, 0.05),
+        (-0.1, 0.2, 0.9, 0.05),
+        (0.3, -0.4, 0.2, 0.8),
+    ],
+)
+def test_quaternion_round_trip(quat: tuple[float, float, float, float]) -> None:
+    matrix = quaternion_xyzw_to_rotation_matrix(quat)
+    result = np.array(rotation_matrix_to_quaternion_xyzw(matrix))
+    expected = np.array(quat) / np.linalg.norm(quat)
+    assert np.allclose(result, expected) or np.allclose(result, -expected)
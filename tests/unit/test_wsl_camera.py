@@ -1,8 +1,17 @@
 from __future__ import annotations
 
+import pytest
+
 from lidar_pc import wsl_camera
 
 
+@pytest.fixture(autouse=True)
+def _on_linux(monkeypatch) -> None:
+    # The helper short-circuits off Linux; the flow itself is exercised on every CI host.
+    monkeypatch.setattr(wsl_camera, "_ON_LINUX", True)
+    wsl_camera._powershell_cache.clear()
+
+
 def test_parse_usbipd_list() -> None:
     sample = """
 BUSID  VID:PID    DEVICE                                                        STATE
@@ -31,10 +40,15 @@ def test_attempt_fix_reports_missing_usbipd(monkeypatch) -> None:
     monkeypatch.setattr(
         wsl_camera,
         "_run_windows_powershell",
-        lambda command, timeout_s=60: (1, "", "usbipd not found"),
+        lambda command, timeout_s=60: (
+            1,
+            "",
+            "usbipd : The term 'usbipd' is not recognized as the name of a cmdlet",
+        ),
     )
     result = wsl_camera.attempt_wsl_camera_fix()
     assert not result.success
+    assert "usbipd_missing" in result.events
     assert any("usbipd is not available" in message for message in result.messages)
 
 
@@ -52,6 +66,9 @@ def test_attempt_fix_reports_vsock_bridge_recovery(monkeypatch) -> None:
     )
     result = wsl_camera.attempt_wsl_camera_fix()
     assert not result.success
+    assert "vsock_bridge_error" in result.events
+    assert "usbipd_missing" not in result.events
+    assert not any("usbipd is not available" in message for message in result.messages)
     assert any("wsl --shutdown" in message for message in result.messages)
 
 
@@ -73,8 +90,6 @@ BUSID  VID:PID    DEVICE
 
     def fake_run(command: str, timeout_s: int = 60) -> tuple[int, str, str]:
         calls.append(command)
-        if command == "Get-Command usbipd -ErrorAction SilentlyContinue":
-            return (0, "usbipd", "")
         if command == "usbipd list":
             return (0, sample, "")
         if command == "usbipd attach --wsl --busid 2-7 --auto-attach":
@@ -86,6 +101,7 @@ BUSID  VID:PID    DEVICE
     monkeypatch.setattr(wsl_camera, "_run_windows_powershell", fake_run)
     result = wsl_camera.attempt_wsl_camera_fix(max_wait_s=0.01)
     assert result.success
+    assert {"retry_with_distro", "attach_success"} <= result.events
     assert any("retrying attach with explicit distro" in message for message in result.messages)
     assert 'usbipd attach --wsl "Ubuntu-24.04" --busid 2-7 --auto-attach' in calls
     assert "usbipd bind --busid 2-7" not in calls
@@ -109,8 +125,6 @@ BUSID  VID:PID    DEVICE
 
     def fake_run(command: str, timeout_s: int = 60) -> tuple[int, str, str]:
         calls.append(command)
-        if command == "Get-Command usbipd -ErrorAction SilentlyContinue":
-            return (0, "usbipd", "")
         if command == "usbipd list":
             return (0, sample, "")
         if command == "usbipd bind --busid 2-7":
@@ -128,6 +142,7 @@ BUSID  VID:PID    DEVICE
     result = wsl_camera.attempt_wsl_camera_fix(max_wait_s=0.05, allow_bind=True)
     assert result.success
     assert "usbipd bind --busid 2-7" in calls
+    assert "attach_after_bind" in result.events
     assert any("camera attach succeeded after bind" in message for message in result.messages)
 
 
@@ -144,8 +159,6 @@ BUSID  VID:PID    DEVICE
 
     def fake_run(command: str, timeout_s: int = 60) -> tuple[int, str, str]:
         calls.append(command)
-        if command == "Get-Command usbipd -ErrorAction SilentlyContinue":
-            return (0, "usbipd", "")
         if command == "usbipd list":
             return (0, sample, "")
         if command == "usbipd attach --wsl --busid 2-7 --auto-attach":
@@ -174,8 +187,6 @@ BUSID  VID:PID    DEVICE
 
     def fake_run(command: str, timeout_s: int = 60) -> tuple[int, str, str]:
         calls.append(command)
-        if command == "Get-Command usbipd -ErrorAction SilentlyContinue":
-            return (0, "usbipd", "")
         if command == "usbipd list":
             return (0, sample, "")
         if command == "usbipd attach --wsl --busid 2-7 --auto-attach":
@@ -189,3 +200,110 @@ BUSID  VID:PID    DEVICE
     assert not result.success
     assert "usbipd bind --busid 2-7" not in calls
     assert any("allow_bind=False" in message for message in result.messages)
+
+
+def test_is_wsl_environment_trusts_distro_env_var(monkeypatch) -> None:
+    monkeypatch.setenv("WSL_DISTRO_NAME", "Ubuntu-24.04")
+    monkeypatch.setattr(wsl_camera.platform, "release", lambda: "6.8.0-generic")
+    wsl_camera.is_wsl_environment.cache_clear()
+    try:
+        assert wsl_camera.is_wsl_environment()
+    finally:
+        wsl_camera.is_wsl_environment.cache_clear()
+
+
+def test_attempt_fix_reports_list_failure_without_probe(monkeypatch) -> None:
+    monkeypatch.setattr(wsl_camera, "is_wsl_environment", lambda: True)
+    monkeypatch.setattr(wsl_camera, "list_linux_video_devices", lambda: [])
+    calls: list[str] = []
+
+    def fake_run(command: str, timeout_s: int = 60) -> tuple[int, str, str]:
+        calls.append(command)
+        return (1, "", "usbipd: error: access denied")
+
+    monkeypatch.setattr(wsl_camera, "_run_windows_powershell", fake_run)
+    result = wsl_camera.attempt_wsl_camera_fix()
+    assert calls == ["usbipd list"]
+    assert result.attempted
+    assert any("unable to enumerate usbipd devices" in message for message in result.messages)
+
+
+def test_attempt_fix_reports_busids_in_list_order(monkeypatch) -> None:
+    monkeypatch.setattr(wsl_camera, "is_wsl_environment", lambda: True)
+    monkeypatch.setattr(wsl_camera, "list_linux_video_devices", lambda: [])
+    monkeypatch.delenv("WSL_DISTRO_NAME", raising=False)
+    sample = """
+BUSID  VID:PID    DEVICE                                                        STATE
+2-7    046d:0825  Logitech Webcam C270                                          Shared
+1-4    8086:0b3a  Intel RealSense D435i                                          Shared
+"""
+
+    def fake_run(command: str, timeout_s: int = 60) -> tuple[int, str, str]:
+        if command == "usbipd list":
+            return (0, sample, "")
+        return (1, "", "device busy")
+
+    monkeypatch.setattr(wsl_camera, "_run_windows_powershell", fake_run)
+    result = wsl_camera.attempt_wsl_camera_fix(max_wait_s=0.01)
+    assert result.matched_busids == ["2-7", "1-4"]
+    attempts = [message for message in result.messages if message.startswith("attempting")]
+    assert attempts == [
+        "attempting usbipd attach for 2-7 (Shared)",
+        "attempting usbipd attach for 1-4 (Shared)",
+    ]
+
+
+def test_attempt_fix_skips_off_linux(monkeypatch) -> None:
+    monkeypatch.setattr(wsl_camera, "_ON_LINUX", False)
+
+    def fail() -> list[str]:
+        raise AssertionError("/dev must not be scanned off Linux")
+
+    monkeypatch.setattr(wsl_camera, "list_linux_video_devices", fail)
+    result = wsl_camera.attempt_wsl_camera_fix()
+    assert not result.attempted
+    assert not result.success
+
+
+def test_parse_usbipd_list_ignores_persisted_guid_rows() -> None:
+    sample = """
+Connected:
+BUSID  VID:PID    DEVICE                                                        STATE
+2-7    046d:0825  Logitech Webcam C270                                          Attached
+
+Persisted:
+GUID                                  DEVICE
+12345678-9abc-def0-1234-56789abcdef0  USB Video Device
+"""
+    devices = wsl_camera.parse_usbipd_list(sample)
+    assert [(d.busid, d.description, d.state) for d in devices] == [
+        ("2-7", "Logitech Webcam C270", "Attached")
+    ]
+
+
+def test_usbipd_list_is_reused_until_attach_changes_state(monkeypatch) -> None:
+    monkeypatch.setattr(wsl_camera, "is_wsl_environment", lambda: True)
+    monkeypatch.setattr(wsl_camera, "list_linux_video_devices", lambda: [])
+    monkeypatch.delenv("WSL_DISTRO_NAME", raising=False)
+    calls: list[str] = []
+    sample = """
+BUSID  VID:PID    DEVICE                                                        STATE
+2-7    046d:0825  Logitech Webcam C270                                          Shared
+"""
+    attach_rc = 1
+
+    def fake_run(command: str, timeout_s: int = 60) -> tuple[int, str, str]:
+        calls.append(command)
+        if command == "usbipd list":
+            return (0, sample, "")
+        return (attach_rc, "", "device busy")
+
+    monkeypatch.setattr(wsl_camera, "_run_windows_powershell", fake_run)
+    wsl_camera.attempt_wsl_camera_fix(max_wait_s=0.01)
+    wsl_camera.attempt_wsl_camera_fix(max_wait_s=0.01)
+    assert calls.count("usbipd list") == 1
+
+    attach_rc = 0
+    wsl_camera.attempt_wsl_camera_fix(max_wait_s=0.01)
+    wsl_camera.attempt_wsl_camera_fix(max_wait_s=0.01)
+    assert calls.count("usbipd list") == 2